@@ -0,0 +1,75 @@
+import os
+import pickle
+import time
+import numpy as np
+import pandas as pd
+from ml_engine.data_loader import fetch_data
+from ml_engine.features import add_technical_features
+from ml_engine.model import StockPredictor
+from ml_engine.tree_export import export_flat_forest, FlatForest
+import warnings
+
+warnings.filterwarnings('ignore')
+
+def _best_time(fn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def benchmark_tree_inference(ticker="AAPL"):
+    print(f"--- Benchmarking Flat Tree Inference for {ticker} ---")
+
+    raw = fetch_data(ticker, period="5y")
+    df = add_technical_features(raw)
+
+    models_to_test = ["random_forest", "xgboost", "hybrid_model_xg_rf"]
+    batch_sizes = [1, 100, 10_000, 1_000_000]
+    rng = np.random.default_rng(42)
+    results = []
+
+    for model_name in models_to_test:
+        try:
+            predictor = StockPredictor(model_type=model_name)
+        except ImportError as e:
+            print(f"-> Skipped {model_name}: {e}")
+            continue
+        predictor.train(df)
+
+        # Export + artifact size/load time
+        artifact = f"{model_name}_flat.npz"
+        export_flat_forest(predictor).save(artifact)
+        load_time = _best_time(lambda: FlatForest.load(artifact), 5)
+        flat = FlatForest.load(artifact)
+        flat_kb = os.path.getsize(artifact) / 1024
+        pickle_kb = len(pickle.dumps(predictor.model)) / 1024
+        os.remove(artifact)
+        print(f"{model_name}: artifact {flat_kb:.0f} KB (pickle {pickle_kb:.0f} KB), load {load_time * 1000:.1f} ms")
+
+        base = df[predictor.features].values
+        for n in batch_sizes:
+            X = pd.DataFrame(base[rng.integers(0, len(base), n)], columns=predictor.features)
+            repeats = 20 if n <= 100 else 3 if n <= 10_000 else 1
+
+            native_time = _best_time(lambda: predictor.model.predict_proba(X), repeats)
+            flat_time = _best_time(lambda: flat.predict_proba(X), repeats)
+            max_diff = np.abs(predictor.model.predict_proba(X)[:, 1] - flat.predict_proba(X)[:, 1]).max()
+
+            results.append({
+                "Model": model_name,
+                "Batch": n,
+                "Native ms": native_time * 1000,
+                "Flat ms": flat_time * 1000,
+                "Speedup": native_time / flat_time,
+                "Max Diff": max_diff
+            })
+
+    print("\n--- Results ---")
+    rdf = pd.DataFrame(results)
+    print(rdf.to_string(index=False, float_format=lambda v: f"{v:.4g}"))
+    rdf.to_csv("tree_inference_results.csv", index=False)
+
+if __name__ == "__main__":
+    benchmark_tree_inference()
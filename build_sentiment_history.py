@@ -0,0 +1,31 @@
+import sys
+import time
+from ml_engine.sentiment_history import load_headline_archive, build_daily_sentiment, save_daily_sentiment
+
+def build_sentiment_history(archive_path, output_path="daily_sentiment.csv", workers=None):
+    print(f"--- Scoring Headline Archive {archive_path} ---")
+
+    # 1. Load
+    start = time.perf_counter()
+    archive = load_headline_archive(archive_path)
+    load_time = time.perf_counter() - start
+    print(f"Loaded {len(archive):,} headlines in {load_time:.2f}s")
+
+    # 2. Score + aggregate
+    start = time.perf_counter()
+    daily = build_daily_sentiment(archive, workers=workers)
+    score_time = time.perf_counter() - start
+
+    throughput = len(archive) / score_time if score_time > 0 else float('inf')
+    print(f"Scored in {score_time:.2f}s -> {throughput:,.0f} headlines/sec")
+    print(f"Daily rows: {len(daily):,} across {daily['ticker'].nunique()} tickers")
+
+    # 3. Store
+    save_daily_sentiment(daily, output_path)
+    print(f"Saved to {output_path}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python build_sentiment_history.py <archive.jsonl|archive.parquet> [output.csv|output.parquet]")
+        sys.exit(1)
+    build_sentiment_history(*sys.argv[1:3])
@@ -5,6 +5,7 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, confusion_matrix, classification_report, f1_score, precision_score
 import pandas as pd
 import numpy as np
+from .sentiment_history import SENTIMENT_FEATURES
 
 # Optional imports for boosting libraries
 try:
@@ -23,7 +24,7 @@ except ImportError:
     CatBoostClassifier = None
 
 class StockPredictor:
-    def __init__(self, model_type='decision_tree'):
+    def __init__(self, model_type='decision_tree', use_sentiment=False):
         self.model_type = model_type
         self.features = [
             'MA5', 'MA10', 'MA20', 'MA50',
@@ -33,6 +34,10 @@ class StockPredictor:
             'BB_Upper', 'BB_Lower', 'BB_Position'
         ]
         
+        # Requires the frame to go through merge_sentiment_asof first
+        if use_sentiment:
+            self.features = self.features + SENTIMENT_FEATURES
+        
         if model_type == 'logistic_regression':
             self.model = LogisticRegression()
         elif model_type == 'random_forest':
@@ -93,6 +98,11 @@ class StockPredictor:
         return StackingClassifier(estimators=estimators, final_estimator=final_estimator)
 
     def train(self, df: pd.DataFrame):
+        missing = [f for f in self.features if f not in df.columns]
+        if missing:
+            hint = " (run merge_sentiment_asof first)" if set(missing) & set(SENTIMENT_FEATURES) else ""
+            raise ValueError(f"Missing feature columns {missing}{hint}")
+        
         X = df[self.features]
         y = df['Target']
         
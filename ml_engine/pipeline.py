@@ -2,9 +2,10 @@ from .data_loader import fetch_data
 from .features import add_technical_features
 from .model import StockPredictor
 from .sentiment import get_sentiment
+from .sentiment_history import load_daily_sentiment, merge_sentiment_asof
 import pandas as pd
 
-def run_pipeline(ticker: str):
+def run_pipeline(ticker: str, sentiment_history: str = None):
     # 1. Fetch data
     df = fetch_data(ticker)
     
@@ -14,8 +15,12 @@ def run_pipeline(ticker: str):
     if len(df_features) < 50:
         raise ValueError("Not enough data to train model")
 
+    # Optional: daily sentiment built by build_sentiment_history.py
+    if sentiment_history:
+        df_features = merge_sentiment_asof(df_features, load_daily_sentiment(sentiment_history), ticker)
+
     # 3. Train
-    predictor = StockPredictor(model_type='hybrid_model_xg_rf')
+    predictor = StockPredictor(model_type='hybrid_model_xg_rf', use_sentiment=bool(sentiment_history))
     metrics = predictor.train(df_features)
     
     # 4. Predict
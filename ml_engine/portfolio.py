@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+# Dates per top-k selection chunk; bounds the argpartition scratch memory
+_SELECT_CHUNK = 512
+
+
+def backtest_portfolio(probs: pd.DataFrame, returns: pd.DataFrame, top_k: int = 10,
+                       weighting: str = 'equal', cost_bps: float = 10.0,
+                       min_prob: float = 0.0, periods_per_year: int = 252) -> dict:
+    """
+    Cross-sectional long-only backtest: each day, hold the top_k tickers by predicted
+    probability of going UP.
+
+    probs and returns are dates x tickers. returns[t] must be the forward return earned
+    by a position opened on t (e.g. Daily_Return.shift(-1)), matching how
+    run_pipeline scores the single-ticker strategy. NaN probabilities are not
+    tradable; NaN returns on held names count as flat.
+
+    weighting is 'equal' or 'probability'. Names below min_prob are left in cash.
+    Turnover is measured against the previous day's weights after they drift with
+    returns, and cost_bps is charged per unit of one-way traded weight.
+    """
+    if weighting not in ('equal', 'probability'):
+        raise ValueError(f"Unknown weighting: {weighting}")
+    if top_k < 1:
+        raise ValueError("top_k must be at least 1")
+    if probs.empty:
+        raise ValueError("No dates/tickers to backtest")
+
+    returns = returns.reindex(index=probs.index, columns=probs.columns)
+    P = probs.values
+    R = returns.values
+    n_days, n_tickers = P.shape
+    k = min(top_k, n_tickers)
+
+    # 1. Top-k selection -> (days, k) ticker indices and weights
+    idx = np.empty((n_days, k), dtype=np.intp)
+    for start in range(0, n_days, _SELECT_CHUNK):
+        chunk = np.nan_to_num(P[start:start + _SELECT_CHUNK], nan=-np.inf)
+        idx[start:start + _SELECT_CHUNK] = np.argpartition(-chunk, k - 1, axis=1)[:, :k]
+
+    rows = np.arange(n_days)[:, None]
+    p_sel = P[rows, idx]
+    valid = np.isfinite(p_sel) & (p_sel >= min_prob)
+
+    raw = np.where(valid, p_sel, 0.0) if weighting == 'probability' else valid.astype(float)
+    total = raw.sum(axis=1, keepdims=True)
+    w = np.divide(raw, total, out=np.zeros_like(raw), where=total > 0)
+
+    # 2. Gross PnL (cash earns nothing)
+    r_sel = np.nan_to_num(R[rows, idx].astype(float))
+    gross = (w * r_sel).sum(axis=1)
+
+    # 3. Turnover vs drifted weights: sum |w_t - d_{t-1}| over both days' names
+    # A day that wipes out the book (gross <= -1) leaves nothing to drift
+    end_value = (1 + gross)[:, None]
+    drifted = np.divide(w * (1 + r_sel), end_value, out=np.zeros_like(w), where=end_value > 0)
+    keys = np.concatenate([(rows * n_tickers + idx).ravel(), (rows[1:] * n_tickers + idx[:-1]).ravel()])
+    deltas = np.concatenate([w.ravel(), -drifted[:-1].ravel()])
+    order = np.argsort(keys, kind='stable')
+    keys, deltas = keys[order], deltas[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    per_name = np.abs(np.add.reduceat(deltas, starts))
+    turnover = np.bincount(keys[starts] // n_tickers, weights=per_name, minlength=n_days)
+
+    # 4. Net PnL, equity, drawdown
+    cost = turnover * cost_bps / 1e4
+    net = gross - cost
+    # Equity cannot go below zero; once ruined it stays at zero
+    equity = np.cumprod(np.maximum(1 + net, 0))
+    peak = np.maximum.accumulate(equity)
+    drawdown = np.divide(equity, peak, out=np.zeros_like(equity), where=peak > 0) - 1
+
+    daily = pd.DataFrame({
+        "gross_return": gross,
+        "turnover": turnover,
+        "cost": cost,
+        "net_return": net,
+        "equity": equity,
+        "drawdown": drawdown,
+        "n_positions": valid.sum(axis=1)
+    }, index=probs.index)
+
+    daily_std = np.std(net)
+    sharpe = 0 if daily_std == 0 else (np.mean(net) / daily_std) * np.sqrt(periods_per_year)
+    years = n_days / periods_per_year
+
+    summary = {
+        "total_return": float(equity[-1] - 1),
+        # 0 ** x is 0, so a ruined book reports -100%
+        "annual_return": float(equity[-1] ** (1 / years) - 1),
+        "sharpe": float(sharpe),
+        "max_drawdown": float(drawdown.min()),
+        "avg_turnover": float(turnover.mean()),
+        "total_cost": float(cost.sum()),
+        "avg_positions": float(valid.sum(axis=1).mean())
+    }
+
+    # holdings[t, j] is the ticker in slot j on day t and weights[t, j] its weight;
+    # empty (cash) slots are None / NaN in both
+    holdings = pd.DataFrame(
+        np.where(valid, probs.columns.values[idx], None),
+        index=probs.index,
+    )
+    weights = pd.DataFrame(np.where(valid, w, np.nan), index=probs.index)
+
+    return {
+        "summary": summary,
+        "daily": daily,
+        "holdings": holdings,
+        "weights": weights
+    }
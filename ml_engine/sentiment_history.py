@@ -0,0 +1,143 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import numpy as np
+import pandas as pd
+
+SENTIMENT_FEATURES = ['Sentiment_Mean', 'Sentiment_Count']
+
+ARCHIVE_COLUMNS = ['ticker', 'published', 'title']
+
+# Created lazily so each worker process builds its own VADER instance
+_analyzer = None
+
+
+def _get_analyzer():
+    global _analyzer
+    if _analyzer is None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def _score_chunk(titles: list) -> list:
+    analyzer = _get_analyzer()
+    return [analyzer.polarity_scores(t)['compound'] for t in titles]
+
+
+def load_headline_archive(path: str) -> pd.DataFrame:
+    """
+    Loads a local archive of timestamped headlines from JSONL, a JSON array or Parquet.
+    Each record needs 'ticker', 'published' and 'title'.
+    """
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path, columns=ARCHIVE_COLUMNS)
+    elif path.endswith('.jsonl'):
+        df = pd.read_json(path, lines=True)
+    elif path.endswith('.json'):
+        df = pd.read_json(path)
+    else:
+        raise ValueError(f"Unsupported archive format: {path}")
+
+    missing = [c for c in ARCHIVE_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Archive is missing columns: {missing}")
+
+    df = df[ARCHIVE_COLUMNS].dropna()
+    df['ticker'] = df['ticker'].astype(str).str.upper()
+    df['title'] = df['title'].astype(str).str.strip()
+    df['published'] = pd.to_datetime(df['published'], utc=True).dt.tz_localize(None)
+    return df[df['title'] != '']
+
+
+def score_headlines(titles, workers: int = None, chunksize: int = 20000) -> np.ndarray:
+    """
+    Scores headlines with VADER, returning the compound score for each one.
+    Identical titles are scored once; large batches are spread over a process pool.
+    """
+    codes, uniques = pd.factorize(pd.Series(titles, dtype=object))
+    uniques = list(uniques)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(uniques) <= chunksize:
+        unique_scores = _score_chunk(uniques)
+    else:
+        chunks = [uniques[i:i + chunksize] for i in range(0, len(uniques), chunksize)]
+        unique_scores = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for scores in pool.map(_score_chunk, chunks):
+                unique_scores.extend(scores)
+
+    return np.asarray(unique_scores, dtype=float)[codes]
+
+
+def build_daily_sentiment(archive: pd.DataFrame, workers: int = None) -> pd.DataFrame:
+    """
+    Aggregates a headline archive into daily sentiment per ticker.
+    The same headline repeated for a ticker on the same day (syndication) counts once.
+    """
+    df = archive.copy()
+    df['Date'] = df['published'].dt.normalize()
+    df = df.drop_duplicates(subset=['ticker', 'Date', 'title'])
+
+    df['score'] = score_headlines(df['title'].values, workers=workers)
+
+    daily = df.groupby(['ticker', 'Date'])['score'].agg(['mean', 'count'])
+    daily.columns = SENTIMENT_FEATURES
+    return daily.reset_index().sort_values(['ticker', 'Date']).reset_index(drop=True)
+
+
+def merge_sentiment_asof(df: pd.DataFrame, daily: pd.DataFrame, ticker: str,
+                         max_staleness_days: int = 5) -> pd.DataFrame:
+    """
+    As-of joins daily sentiment onto the output of add_technical_features.
+    Each news day is bucketed into the first row dated strictly after it, so a row
+    dated D only sees headlines from before D (those published on D may land after
+    the close used for that row's features). Every news day since the previous row
+    counts, e.g. a Monday row aggregates Friday, Saturday and Sunday.
+    News days more than max_staleness_days before their row are dropped; rows with
+    no sentiment get a neutral score and zero count.
+    """
+    df = df.copy()
+
+    dates = pd.DatetimeIndex(df.index)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    dates = dates.normalize().astype('datetime64[ns]')
+    trading_days = np.unique(dates.values)
+
+    series = daily[daily['ticker'] == ticker.upper()]
+    news_days = series['Date'].values.astype('datetime64[ns]')
+
+    # First row date strictly after each news day; news after the last row has no row yet
+    pos = np.searchsorted(trading_days, news_days, side='right')
+    keep = pos < len(trading_days)
+    bucket = trading_days[pos[keep]]
+    keep_fresh = (bucket - news_days[keep]) <= np.timedelta64(max_staleness_days, 'D')
+
+    counts = series['Sentiment_Count'].values[keep][keep_fresh]
+    totals = series['Sentiment_Mean'].values[keep][keep_fresh] * counts
+    buckets = pd.DataFrame({'total': totals, 'count': counts}, index=bucket[keep_fresh])
+    buckets = buckets.groupby(level=0).sum().reindex(dates)
+
+    df['Sentiment_Mean'] = (buckets['total'] / buckets['count']).fillna(0.0).values
+    df['Sentiment_Count'] = buckets['count'].fillna(0).astype(int).values
+    return df
+
+
+def save_daily_sentiment(daily: pd.DataFrame, path: str):
+    if path.endswith('.parquet'):
+        daily.to_parquet(path, index=False)
+    else:
+        daily.to_csv(path, index=False)
+
+
+def load_daily_sentiment(path: str) -> pd.DataFrame:
+    if path.endswith('.parquet'):
+        daily = pd.read_parquet(path)
+    else:
+        daily = pd.read_csv(path)
+    daily['Date'] = pd.to_datetime(daily['Date'])
+    return daily
@@ -0,0 +1,280 @@
+import json
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier, VotingClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+try:
+    from xgboost import XGBClassifier
+except ImportError:
+    XGBClassifier = None
+
+# Rows x trees cells traversed per chunk; bounds the per-chunk scratch arrays
+_CHUNK_CELLS = 65_536
+
+# Trees are expanded to complete binary trees at load time, so depth is capped
+MAX_FLAT_DEPTH = 16
+
+
+class FlatForest:
+    """
+    Tree ensemble flattened into contiguous node arrays, scored with a vectorized
+    NumPy traversal over all trees at once.
+
+    The artifact stores compact pointer arrays; on construction each component is
+    expanded into a complete-binary-tree layout used for traversal.
+
+    Each component is one fitted ensemble: 'mean_proba' components (sklearn trees)
+    average leaf class-1 probabilities, 'logit_sum' components (XGBoost) sum leaf
+    margins onto a base margin and apply a sigmoid. Component probabilities are
+    combined with the soft-voting weights.
+    """
+
+    def __init__(self, features, components, weights):
+        self.features = list(features)
+        self.components = components
+        self.weights = np.asarray(weights, dtype=float)
+        self._layouts = [_complete_layout(comp) for comp in components]
+
+    def predict_proba(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            X = X[self.features].values
+        # Both sklearn and XGBoost compare features in float32
+        X = np.ascontiguousarray(X, dtype=np.float32)
+
+        up = np.zeros(len(X))
+        for comp, layout, weight in zip(self.components, self._layouts, self.weights):
+            up += weight * _component_proba(comp, layout, X)
+        up /= self.weights.sum()
+        return np.column_stack([1 - up, up])
+
+    def save(self, path: str):
+        arrays = {}
+        meta = {"features": self.features, "weights": self.weights.tolist(), "components": []}
+        for i, comp in enumerate(self.components):
+            meta["components"].append({k: v for k, v in comp.items() if not isinstance(v, np.ndarray)})
+            for k, v in comp.items():
+                if isinstance(v, np.ndarray):
+                    arrays[f"{i}_{k}"] = v
+        np.savez(path, meta=np.array(json.dumps(meta)), **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "FlatForest":
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            components = []
+            for i, comp in enumerate(meta["components"]):
+                comp = dict(comp)
+                prefix = f"{i}_"
+                for k in data.files:
+                    if k.startswith(prefix):
+                        comp[k[len(prefix):]] = data[k]
+                components.append(comp)
+        return cls(meta["features"], components, meta["weights"])
+
+
+def export_flat_forest(predictor) -> FlatForest:
+    """
+    Flattens the fitted tree model of a StockPredictor. Supports decision_tree,
+    random_forest, xgboost and hybrid_model_xg_rf.
+    """
+    model = predictor.model
+
+    if isinstance(model, VotingClassifier):
+        if model.voting != 'soft':
+            raise ValueError("Only soft voting can be flattened")
+        weights = model.weights if model.weights is not None else [1.0] * len(model.estimators_)
+        components = [_flatten_estimator(est) for est in model.estimators_]
+    else:
+        weights = [1.0]
+        components = [_flatten_estimator(model)]
+
+    return FlatForest(predictor.features, components, weights)
+
+
+def _flatten_estimator(est) -> dict:
+    if isinstance(est, RandomForestClassifier):
+        return _flatten_sklearn([t.tree_ for t in est.estimators_], est.classes_)
+    if isinstance(est, DecisionTreeClassifier):
+        return _flatten_sklearn([est.tree_], est.classes_)
+    if XGBClassifier is not None and isinstance(est, XGBClassifier):
+        return _flatten_xgboost(est)
+    raise ValueError(f"Cannot flatten model of type {type(est).__name__}")
+
+
+def _pack(trees) -> dict:
+    """
+    Concatenates per-tree node lists into one set of arrays. Child pointers are
+    rebased to global node ids and leaves point to themselves.
+    """
+    sizes = [len(t["feature"]) for t in trees]
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int32)
+
+    feature, threshold, left, right, default_left, value = [], [], [], [], [], []
+    for t, off in zip(trees, offsets):
+        is_leaf = t["left"] < 0
+        own = np.arange(len(is_leaf), dtype=np.int32)
+        left.append(np.where(is_leaf, own, t["left"]).astype(np.int32) + off)
+        right.append(np.where(is_leaf, own, t["right"]).astype(np.int32) + off)
+        feature.append(np.where(is_leaf, 0, t["feature"]).astype(np.int32))
+        threshold.append(t["threshold"].astype(np.float32))
+        default_left.append(t["default_left"].astype(bool))
+        value.append(t["value"].astype(np.float32))
+
+    max_depth = int(max(t["depth"] for t in trees))
+    if max_depth > MAX_FLAT_DEPTH:
+        raise ValueError(f"Tree depth {max_depth} exceeds MAX_FLAT_DEPTH ({MAX_FLAT_DEPTH})")
+
+    return {
+        "roots": offsets,
+        "max_depth": max_depth,
+        "feature": np.concatenate(feature),
+        "threshold": np.concatenate(threshold),
+        "left": np.concatenate(left),
+        "right": np.concatenate(right),
+        "default_left": np.concatenate(default_left),
+        "value": np.concatenate(value),
+    }
+
+
+def _flatten_sklearn(tree_structs, classes) -> dict:
+    up_idx = int(np.flatnonzero(classes == 1)[0])
+    trees = []
+    for ts in tree_structs:
+        counts = ts.value[:, 0, :]
+        value = counts[:, up_idx] / counts.sum(axis=1)
+
+        # sklearn tests float32(x) <= float64 threshold; rounding the threshold down
+        # to the nearest float32 gives the same decision in pure float32
+        thr32 = ts.threshold.astype(np.float32)
+        over = thr32.astype(np.float64) > ts.threshold
+        thr32[over] = np.nextafter(thr32[over], np.float32(-np.inf))
+
+        missing_left = getattr(ts, "missing_go_to_left", np.zeros(ts.node_count, dtype=bool))
+        trees.append({
+            "feature": ts.feature,
+            "threshold": thr32,
+            "left": ts.children_left,
+            "right": ts.children_right,
+            "default_left": np.asarray(missing_left, dtype=bool),
+            "value": value,
+            "depth": ts.max_depth,
+        })
+
+    comp = _pack(trees)
+    comp.update({"kind": "mean_proba", "strict": False})
+    return comp
+
+
+def _flatten_xgboost(est) -> dict:
+    raw = json.loads(est.get_booster().save_raw("json"))
+    learner = raw["learner"]
+    if learner["objective"]["name"] != "binary:logistic":
+        raise ValueError("Only binary:logistic XGBoost models can be flattened")
+    booster = learner["gradient_booster"]
+    if booster["name"] != "gbtree":
+        raise ValueError("Only gbtree XGBoost models can be flattened")
+
+    trees = []
+    for t in booster["model"]["trees"]:
+        if any(t["split_type"]):
+            raise ValueError("Categorical XGBoost splits are not supported")
+        left = np.asarray(t["left_children"])
+        right = np.asarray(t["right_children"])
+        trees.append({
+            "feature": np.asarray(t["split_indices"]),
+            "threshold": np.asarray(t["split_conditions"], dtype=np.float32),
+            "left": left,
+            "right": right,
+            "default_left": np.asarray(t["default_left"], dtype=bool),
+            # Leaves keep their (eta-scaled) weight in split_conditions
+            "value": np.asarray(t["split_conditions"], dtype=np.float32),
+            "depth": _depth(left, right),
+        })
+
+    base_score = float(learner["learner_model_param"]["base_score"].strip("[]"))
+    comp = _pack(trees)
+    comp.update({
+        "kind": "logit_sum",
+        "strict": True,
+        "base_margin": float(np.log(base_score / (1 - base_score))),
+    })
+    return comp
+
+
+def _depth(left, right) -> int:
+    depth = np.zeros(len(left), dtype=int)
+    # XGBoost stores parents before children, so one forward pass suffices
+    for node in range(len(left)):
+        if left[node] >= 0:
+            depth[left[node]] = depth[node] + 1
+            depth[right[node]] = depth[node] + 1
+    return int(depth.max())
+
+
+def _complete_layout(comp) -> dict:
+    """
+    Re-lays every tree of a component as a complete binary tree of depth max_depth,
+    so node i's children are 2i+1 and 2i+2 and traversal needs no child lookups.
+    Leaves above the last level are repeated down both branches.
+    """
+    left, right = comp["left"], comp["right"]
+    level = comp["roots"][:, None]
+    feature, threshold, default_left = [], [], []
+    for _ in range(comp["max_depth"]):
+        feature.append(comp["feature"][level])
+        threshold.append(comp["threshold"][level])
+        default_left.append(comp["default_left"][level])
+        level = np.stack([left[level], right[level]], axis=2).reshape(len(level), -1)
+
+    def flat(parts, dtype):
+        if not parts:
+            return np.zeros(0, dtype=dtype)
+        return np.concatenate(parts, axis=1).ravel().astype(dtype)
+
+    return {
+        "feature": flat(feature, np.intp),
+        "threshold": flat(threshold, np.float32),
+        "default_left": flat(default_left, bool),
+        "leaf": comp["value"][level].ravel(),
+    }
+
+
+def _leaf_sum(comp, layout, X) -> np.ndarray:
+    """
+    Returns the sum over trees of the leaf value each row reaches, shape (rows,).
+    Leaves are reduced per chunk so only a chunk's (rows, trees) block is ever held.
+    """
+    n_trees, depth = len(comp["roots"]), comp["max_depth"]
+    n_splits = 2 ** depth - 1
+    feature, threshold, default_left = layout["feature"], layout["threshold"], layout["default_left"]
+    split_offset = (np.arange(n_trees) * n_splits)[None, :]
+    leaf_offset = (np.arange(n_trees) * (n_splits + 1))[None, :]
+    has_nan = bool(np.isnan(X).any())
+
+    out = np.empty(len(X), dtype=np.float64)
+    step = max(1, _CHUNK_CELLS // n_trees)
+    for start in range(0, len(X), step):
+        Xc = X[start:start + step]
+        row_offset = (np.arange(len(Xc)) * X.shape[1])[:, None]
+        values = Xc.ravel()
+
+        node = np.zeros((len(Xc), n_trees), dtype=np.intp)
+        for _ in range(depth):
+            idx = node + split_offset
+            x = values[feature[idx] + row_offset]
+            go_right = x >= threshold[idx] if comp["strict"] else x > threshold[idx]
+            if has_nan:
+                go_right = np.where(np.isnan(x), ~default_left[idx], go_right)
+            node = 2 * node + 1 + go_right
+        leaves = layout["leaf"][node - n_splits + leaf_offset]
+        out[start:start + step] = leaves.sum(axis=1, dtype=np.float64)
+    return out
+
+
+def _component_proba(comp, layout, X) -> np.ndarray:
+    total = _leaf_sum(comp, layout, X)
+    if comp["kind"] == "mean_proba":
+        return total / len(comp["roots"])
+    margin = comp["base_margin"] + total
+    return 1 / (1 + np.exp(-margin))
@@ -0,0 +1,63 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from ml_engine.data_loader import fetch_data
+from ml_engine.features import add_technical_features
+from ml_engine.model import StockPredictor
+from ml_engine.portfolio import backtest_portfolio
+import warnings
+
+warnings.filterwarnings('ignore')
+
+def build_probability_matrix(tickers, model_type='hybrid_model_xg_rf'):
+    """
+    Trains one model per ticker and collects its test-set probabilities and the
+    matching forward returns into dates x tickers frames.
+    """
+    probs, returns = {}, {}
+    for ticker in tickers:
+        try:
+            df = add_technical_features(fetch_data(ticker, period="5y"))
+            predictor = StockPredictor(model_type=model_type)
+            res = predictor.train(df)
+        except Exception as e:
+            print(f"-> Skipped {ticker}: {e}")
+            continue
+
+        # train() holds out the last 20% of rows
+        test_df = df.iloc[-len(res['y_prob']):]
+        probs[ticker] = pd.Series(res['y_prob'], index=test_df.index)
+        # Prediction at t is realized by the return at t+1
+        returns[ticker] = test_df['Daily_Return'].shift(-1).fillna(0)
+
+    return pd.DataFrame(probs).sort_index(), pd.DataFrame(returns).sort_index()
+
+def run_portfolio(tickers, top_k=3):
+    print(f"--- Portfolio Backtest: top {top_k} of {len(tickers)} tickers ---")
+    probs, returns = build_probability_matrix(tickers)
+
+    results = []
+    for weighting in ['equal', 'probability']:
+        res = backtest_portfolio(probs, returns, top_k=top_k, weighting=weighting)
+        results.append({"Weighting": weighting, **res['summary']})
+
+    rdf = pd.DataFrame(results)
+    print(rdf.round(4).to_string(index=False))
+
+def benchmark_scaling(n_days=10_000, n_tickers=3_000, top_k=50):
+    print(f"--- Scaling Benchmark: {n_days:,} days x {n_tickers:,} tickers, top {top_k} ---")
+    rng = np.random.default_rng(42)
+    probs = pd.DataFrame(rng.random((n_days, n_tickers), dtype=np.float32))
+    returns = pd.DataFrame(rng.normal(0, 0.02, (n_days, n_tickers)).astype(np.float32))
+
+    for weighting in ['equal', 'probability']:
+        start = time.perf_counter()
+        backtest_portfolio(probs, returns, top_k=top_k, weighting=weighting)
+        print(f"{weighting}: {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        benchmark_scaling()
+    else:
+        run_portfolio(sys.argv[1:] or ["AAPL", "MSFT", "NVDA", "GOOGL", "AMZN", "META", "TSLA"])